@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+
+import datetime
+import email.utils
+import io
+import unittest
+
+import verseek_lib
+
+CHANGELOG = """pkg (1.2-1) unstable; urgency=low
+
+  * second release
+
+ -- Nobody <nobody@example.com>  Tue, 02 Jan 2024 00:00:00 +0000
+
+pkg (1.1-1) unstable; urgency=low
+
+  * first release
+
+ -- Nobody <nobody@example.com>  Mon, 01 Jan 2024 00:00:00 +0000
+"""
+
+
+class ParseChangelogTest(unittest.TestCase):
+    """parse_changelog returns the version of the first stanza"""
+
+    def test_str(self) -> None:
+        self.assertEqual(verseek_lib.parse_changelog(CHANGELOG), "1.2-1")
+
+    def test_bytes(self) -> None:
+        self.assertEqual(
+            verseek_lib.parse_changelog(CHANGELOG.encode()), "1.2-1")
+
+    def test_iterable(self) -> None:
+        self.assertEqual(
+            verseek_lib.parse_changelog(CHANGELOG.splitlines(True)), "1.2-1")
+        self.assertEqual(
+            verseek_lib.parse_changelog(io.StringIO(CHANGELOG)), "1.2-1")
+
+    def test_leading_blank_lines(self) -> None:
+        changelog = "\n\n" + CHANGELOG
+        self.assertEqual(verseek_lib.parse_changelog(changelog), "1.2-1")
+        self.assertEqual(
+            verseek_lib.parse_changelog(changelog.encode()), "1.2-1")
+        self.assertEqual(
+            verseek_lib.parse_changelog(changelog.splitlines(True)), "1.2-1")
+
+    def test_header_after_indented_block(self) -> None:
+        # only the first stanza's header counts; once its entries have
+        # begun, a later header isn't the changelog's version
+        changelog = "  * stray entry\n\n" + CHANGELOG
+        self.assertIsNone(verseek_lib.parse_changelog(changelog))
+        self.assertIsNone(verseek_lib.parse_changelog(changelog.encode()))
+        self.assertIsNone(
+            verseek_lib.parse_changelog(changelog.splitlines(True)))
+
+    def test_no_header(self) -> None:
+        self.assertIsNone(verseek_lib.parse_changelog("not a changelog\n"))
+        self.assertIsNone(verseek_lib.parse_changelog(b""))
+        self.assertIsNone(verseek_lib.parse_changelog([]))
+
+
+class Rfc5322DateTest(unittest.TestCase):
+    """_rfc5322_date matches the stdlib's RFC 5322 formatting (in UTC)"""
+
+    def test_matches_formatdate(self) -> None:
+        # every weekday and month, single digit days, leap days, both
+        # ends of the day and years either side of the epoch
+        timestamps = [0, 1, 59, 86399, 951782400, 1700000000, 1709164800,
+                      2147483647, 4102444799, -86400, -2208988800]
+        # 2024 in 13 day (and an hour) steps, cycling through the weekdays
+        start = 1704067200
+        timestamps += range(start, start + 366 * 86400, 13 * 86400 + 3607)
+
+        for timestamp in timestamps:
+            dt = (datetime.datetime(1970, 1, 1)
+                  + datetime.timedelta(seconds=timestamp))
+            expected = email.utils.formatdate(timestamp, localtime=False)
+            with self.subTest(dt=dt):
+                self.assertEqual(verseek_lib._rfc5322_date(dt),
+                                 expected.replace("-0000", "+0000"))
+
+
+if __name__ == "__main__":
+    unittest.main()
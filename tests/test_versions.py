@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+
+import email.utils
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import verseek_lib
+
+CONTROL = "Source: pkg\nMaintainer: Nobody <nobody@example.com>\n"
+CHANGELOG = """pkg ({}) unstable; urgency=low
+
+  * changes
+
+ -- Nobody <nobody@example.com>  Mon, 01 Jan 2024 00:00:00 +0000
+"""
+
+
+class RepoTestCase(unittest.TestCase):
+    """base for tests against a scratch package repository"""
+
+    def setUp(self) -> None:
+        self.path = tempfile.mkdtemp()
+        self.timestamp = 1700000000
+        os.mkdir(os.path.join(self.path, "debian"))
+        with open(os.path.join(self.path, "debian/control"), "w") as fob:
+            fob.write(CONTROL)
+        self.git("init", "-q", "-b", "master")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.path)
+
+    def git(self, *args: str, check: bool = True) -> None:
+        self.timestamp += 60
+        date = f"@{self.timestamp} +0000"
+        env = dict(os.environ,
+                   GIT_AUTHOR_NAME="Nobody",
+                   GIT_AUTHOR_EMAIL="nobody@example.com",
+                   GIT_COMMITTER_NAME="Nobody",
+                   GIT_COMMITTER_EMAIL="nobody@example.com",
+                   GIT_AUTHOR_DATE=date,
+                   GIT_COMMITTER_DATE=date)
+        subprocess.run(["git", *args], cwd=self.path, env=env, check=check,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def write_changelog(self, version: str) -> None:
+        with open(os.path.join(self.path, "debian/changelog"), "w") as fob:
+            fob.write(CHANGELOG.format(version))
+
+    def release(self, version: str) -> None:
+        self.write_changelog(version)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", version)
+
+
+class IncrementalVersionsTest(RepoTestCase):
+    """the versions cache, extended incrementally, must match a full walk"""
+
+    def list_versions(self) -> list:
+        return verseek_lib.Git(self.path).list_versions()
+
+    def full_walk(self) -> list:
+        os.remove(os.path.join(self.path, ".git/verseek-cache"))
+        return self.list_versions()
+
+    def test_fast_forward(self) -> None:
+        self.release("1.0")
+        self.release("1.1")
+        self.list_versions()
+
+        self.release("1.2")
+        self.release("1.3")
+
+        incremental = self.list_versions()
+        self.assertEqual(incremental, ["1.3", "1.2", "1.1", "1.0"])
+        self.assertEqual(incremental, self.full_walk())
+
+    def test_merged_side_branch(self) -> None:
+        self.release("1.0")
+        self.release("1.1")
+        self.git("branch", "side")
+        self.git("checkout", "-q", "side")
+        self.release("1.1s")
+        self.git("checkout", "-q", "master")
+        self.release("1.2")
+        self.list_versions()
+
+        # both sides changed the changelog, so the merge stops to resolve it
+        self.git("merge", "-q", "--no-commit", "side", check=False)
+        self.write_changelog("1.3")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "1.3")
+
+        incremental = self.list_versions()
+        self.assertEqual(incremental, self.full_walk())
+
+
+class TagAutoversion:
+    """resolves every version to the same tag, as Autoversion may"""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+
+    def version2commit(self, version: str) -> str:
+        return self.tag
+
+
+class SeekAnnotatedTagTest(RepoTestCase):
+    """seeking a package without a changelog to an annotated tag"""
+
+    def test_seek_annotated_tag(self) -> None:
+        with open(os.path.join(self.path, "file"), "w") as fob:
+            fob.write("1.0\n")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "one")
+        tagged = self.timestamp
+        self.git("tag", "-a", "-m", "v1.0", "v1.0")
+        with open(os.path.join(self.path, "file"), "w") as fob:
+            fob.write("2.0\n")
+        self.git("commit", "-q", "-a", "-m", "two")
+
+        single = verseek_lib.new(self.path)
+        self.assertIsInstance(single, verseek_lib.GitSingle)
+        single._autoversion = TagAutoversion("v1.0")
+        single.seek_version("1.0")
+
+        with open(os.path.join(self.path, "file")) as fob:
+            self.assertEqual(fob.read(), "1.0\n")
+        with open(os.path.join(self.path, "debian/changelog")) as fob:
+            changelog = fob.read()
+        self.assertTrue(changelog.startswith("pkg (1.0) UNRELEASED;"))
+        date = email.utils.formatdate(tagged, localtime=False)
+        self.assertIn(date.replace("-0000", "+0000"), changelog)
+
+        verseek_lib.new(self.path).seek_version()
+        with open(os.path.join(self.path, "file")) as fob:
+            self.assertEqual(fob.read(), "2.0\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,22 +7,34 @@
 # Free Software Foundation; either version 3 of the License, or (at your
 # option) any later version.
 
-from os.path import join, isdir, exists, abspath, relpath, basename
+from os.path import join, isdir, exists, abspath, relpath, basename, dirname
 
 import os
+import io
 import re
+import stat
+import json
+import collections
 import datetime
 import locale
+import tempfile
 import subprocess
+import threading
+import contextlib
 from typing import (
-        Optional, List, Generic, Union, AnyStr, Tuple, TypeVar, Iterable, Type,
-        Dict
+        Optional, List, Generic, Union, Tuple, TypeVar, Iterable, Type,
+        Dict, Iterator, IO
 )
 from types import TracebackType
 
 import gitwrapper as git
 from autoversion_lib import Autoversion
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 Locale = Optional[Union[str, Iterable[str]]]
 AnyPath = TypeVar('AnyPath', str, os.PathLike)
 
@@ -55,25 +67,98 @@ class VerseekError(Exception):
     pass
 
 
-def parse_changelog(changelog: str) -> Optional[str]:
+# a changelog stanza header, kept from spanning lines so it can be matched
+# against single lines or anywhere in a whole (multiline) changelog
+_CHANGELOG_PATTERN = r"^\w[-+0-9a-z.]* \(([^\(\) \t]+)\)(?:[^\S\n]+[-+0-9a-z.]+)+\;"
+
+# compiled once for each of str (files, lines) and bytes (git blobs)
+_CHANGELOG_RE = re.compile(_CHANGELOG_PATTERN, re.I | re.M)
+_CHANGELOG_BLOB_RE = re.compile(_CHANGELOG_PATTERN.encode(), re.I | re.M)
+
+# the start of a stanza's entries
+_CHANGELOG_ENTRY_RE = re.compile(rb"^[ \t]", re.M)
+
+
+def parse_changelog(
+        changelog: Union[str, bytes, Iterable[str]]
+) -> Optional[str]:
     """Parses the contents of the changelog
 
     Args:
-        changelog: raw text contents of a changelog file
+        changelog: raw text or bytes contents of a changelog file, or an
+                   iterable of its lines (e.g. an open file object)
 
     Returns:
         the most recent version as a string or None
     """
-    for line in changelog.split("\n"):
-        m = re.match(
-            r"^\w[-+0-9a-z.]* \(([^\(\) \t]+)\)(?:\s+[-+0-9a-z.]+)+\;", line, re.I
-        )
+    # a well formed changelog starts with the header, so try matching just
+    # the first line before doing anything more expensive
+    if isinstance(changelog, str):
+        m = _CHANGELOG_RE.match(changelog)
+        if m:
+            return m.group(1)
+
+    if isinstance(changelog, bytes):
+        m = _CHANGELOG_BLOB_RE.match(changelog)
+        if m:
+            return m.group(1).decode(errors="replace")
+
+        # scan the raw blob in the regex engine rather than line by line
+        # in Python, stopping where the first stanza's entries begin
+        entry = _CHANGELOG_ENTRY_RE.search(changelog)
+        end = entry.start() if entry else len(changelog)
+        m = _CHANGELOG_BLOB_RE.search(changelog, 0, end)
+        return m.group(1).decode(errors="replace") if m else None
+
+    lines = io.StringIO(changelog) if isinstance(changelog, str) else changelog
+    for line in lines:
+        m = _CHANGELOG_RE.match(line)
         if m:
             return m.group(1)
 
+        # only the first stanza's header matters; once we're into its
+        # entries without having found one, there's no version to report
+        if line[:1] in (" ", "\t"):
+            break
+
     return None
 
 
+_git_root_cache: Dict[str, Optional[str]] = {}
+
+# changelog version by git object name (a blob id or `<commit>:<path>`);
+# both always name the same contents, so entries never go stale, but the
+# least recently used are dropped so long lived processes stay bounded.
+# The lock is there because cat-file's writer thread looks entries up.
+_CHANGELOG_VERSION_CACHE_SIZE = 4096
+_changelog_version_cache: 'collections.OrderedDict[str, Optional[str]]' = \
+    collections.OrderedDict()
+_changelog_version_lock = threading.Lock()
+
+
+def _get_changelog_version(obj: str) -> Tuple[bool, Optional[str]]:
+    """Look up the cached changelog version of a git object
+
+    Returns:
+        a (found, version) tuple
+    """
+    with _changelog_version_lock:
+        if obj not in _changelog_version_cache:
+            return False, None
+
+        _changelog_version_cache.move_to_end(obj)
+        return True, _changelog_version_cache[obj]
+
+
+def _set_changelog_version(obj: str, version: Optional[str]) -> None:
+    """Cache the changelog version of a git object"""
+    with _changelog_version_lock:
+        _changelog_version_cache[obj] = version
+        _changelog_version_cache.move_to_end(obj)
+        if len(_changelog_version_cache) > _CHANGELOG_VERSION_CACHE_SIZE:
+            _changelog_version_cache.popitem(last=False)
+
+
 class Base(Generic[AnyPath]):
     """Version seeking base class
 
@@ -85,16 +170,66 @@ class Base(Generic[AnyPath]):
     path_changelog: str
     path_control: str
 
+    _control_cache: Dict[Tuple[str, int, int], Dict[str, str]] = {}
+    _CONTROL_FIELDS = (b"Source", b"Maintainer")
+
+    @classmethod
+    def _parse_control(cls, path: str) -> Dict[str, str]:
+        """Parses the source stanza fields we use from a control file
+
+        Stops reading as soon as `Source` and `Maintainer` have been seen.
+        Results are cached until the file changes.
+
+        Args:
+            path: path to a `debian/control` file
+
+        Returns:
+            a dict of field names to values
+        """
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        control = cls._control_cache.get(key)
+        if control is not None:
+            return control
+
+        fields = {}
+        with open(path, "rb") as fob:
+            for line in fob:
+                if line[:1] in (b" ", b"\t", b"#"):
+                    continue
+
+                name, sep, value = line.partition(b":")
+                if not sep:
+                    continue
+
+                fields[name.rstrip()] = value.strip()
+                if all(field in fields for field in cls._CONTROL_FIELDS):
+                    break
+
+        control = {
+            name.decode(errors="replace"): value.decode(errors="replace")
+            for name, value in fields.items()
+        }
+        cls._control_cache[key] = control
+        return control
+
     def __init__(self, path: AnyPath):
         spath = fspath(path)
-        if not isdir(spath):
-            raise VerseekError(f"no such directory `{path}'")
 
         self.path = spath
         self.path_changelog = join(self.path, "debian/changelog")
         self.path_control = join(self.path, "debian/control")
 
-        if not exists(self.path_control):
+        # a single stat answers the common case; only work out which
+        # error to report if it fails
+        try:
+            st = os.stat(self.path_control)
+        except OSError:
+            st = None
+
+        if st is None or not stat.S_ISREG(st.st_mode):
+            if not isdir(spath):
+                raise VerseekError(f"no such directory `{path}'")
             raise VerseekError(f"missing debian/control file `{self.path_control}'")
 
     def list_versions(self) -> List[str]:
@@ -118,14 +253,15 @@ class Plain(Base):
     """
 
     def _get_version(self) -> str:
-        changelogfile = join(self.path, "debian/changelog")
-        if not exists(changelogfile):
+        changelogfile = self.path_changelog
+        try:
+            with open(changelogfile, "r") as fob:
+                version = parse_changelog(fob)
+        except FileNotFoundError:
             raise VerseekError(
                 "no such file or directory `{}'" "".format(changelogfile)
             )
 
-        with open(changelogfile, "r") as fob:
-            version = parse_changelog(fob.read())
         if not version:
             raise VerseekError("can't parse version from `{}'" "".format(changelogfile))
 
@@ -151,31 +287,33 @@ class Git(Base):
     Attributes:
         path_changelog: a bytes or string path to the `debian/changelog` file
         path_control: a bytes or string path to the `debian/control` file
+        path_versions_cache: a path to the on-disk cache of listed versions
     """
 
     class Head:
         ref = "HEAD"
 
         def __get__(self, obj: 'Git', type: Type['Git']) -> str:
-            try:
-                return obj.git.symbolic_ref(self.ref)
-            except git.GitError:
+            head = obj._resolve_head_refs()[1]
+            if head is None:
                 raise VerseekError("HEAD isn't pointing to a branch")
 
+            return head
+
     class VerseekHead:
         ref = "VERSEEK_HEAD"
 
         def __get__(self, obj: 'Git', type: Type['Git']) -> Optional[str]:
-            try:
-                return obj.git.symbolic_ref(self.ref)
-            except git.GitError:
-                return None
+            return obj._resolve_head_refs()[0]
 
         def __set__(self, obj: 'Git', val: Optional[str]) -> None:
+            current = obj._resolve_head_refs()[0]
+            obj._resolved_refs = None
             if val is None:
-                ref_path = join(obj.path, ".git", self.ref)
-                if exists(ref_path):
-                    os.remove(ref_path)
+                # let git delete the ref wherever it keeps it; a missing
+                # VERSEEK_HEAD is fine, failing to delete one isn't
+                if current is not None:
+                    obj._git_output("symbolic-ref", "--delete", self.ref)
             else:
                 obj.git.symbolic_ref(self.ref, val)
 
@@ -183,58 +321,595 @@ class Git(Base):
     head = Head()
 
     @staticmethod
-    def get_git_root(directory: AnyPath) -> Optional[AnyPath]:
+    def get_git_root(directory: AnyPath) -> Optional[str]:
         """Walk up dir until we get the gitdir.
 
+        Results are cached for every directory visited on the way up, so
+        later lookups anywhere below an already walked path are a single
+        dict lookup.
+
         Args:
             directory: pathlike pointing towards a git repo
 
         Returns:
-            a path to the `.git` directory of a git repo or `None` if no
+            a path to the directory containing `.git` or `None` if no
             `.git` directory is found
         """
-        sdirectory = fspath(directory)
-        sdirectory = abspath(sdirectory)
+        # split once and walk up by index ('/' itself is never a candidate)
+        parts = abspath(fspath(directory)).split(os.sep)
+        git_dir = os.sep + ".git"
+
+        visited = []
+        git_root = None
+        for i in range(len(parts), 1, -1):
+            sdirectory = os.sep.join(parts[:i])
+            if sdirectory in _git_root_cache:
+                git_root = _git_root_cache[sdirectory]
+                break
+
+            visited.append(sdirectory)
+            try:
+                st = os.stat(sdirectory + git_dir)
+            except OSError:
+                continue
 
-        root = "/"
-        git_dir = ".git"
+            if stat.S_ISDIR(st.st_mode):
+                git_root = sdirectory
+                break
 
-        while True:
-            if isdir(join(directory, git_dir)):
-                return directory
+        for visited_directory in visited:
+            _git_root_cache[visited_directory] = git_root
 
-            directory, _ = os.path.split(directory)
-            if directory == root:
-                return None
+        return git_root
 
     def __init__(self, path: AnyPath):
         Base.__init__(self, path)
         git_root = self.get_git_root(self.path)
         assert git_root is not None
         self.git = git.Git(git_root)
+        self.path_versions_cache = join(self.git.path, ".git", "verseek-cache")
+        # the changelog as git names it, relative to the repository root
+        self._path_changelog_rel = relpath(self.path_changelog, self.git.path)
+        self._cat_file_proc: Optional[subprocess.Popen] = None
+        self._versions_cache: Dict[str, dict] = {}
+        self._commit_graph_checked = False
+        self._resolved_refs: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+        # read objects in-process through libgit2 when it's available
+        self.repo = None
+        if pygit2 is not None:
+            try:
+                self.repo = pygit2.Repository(git_root)
+            except pygit2.GitError:
+                pass
+
+    def close(self) -> None:
+        """Stop the git helper processes this instance keeps running"""
+        proc = getattr(self, "_cat_file_proc", None)
+        if proc is not None:
+            self._cat_file_proc = None
+            assert proc.stdin is not None and proc.stdout is not None
+            with contextlib.suppress(OSError):
+                proc.stdin.close()
+            proc.wait()
+            with contextlib.suppress(OSError):
+                proc.stdout.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def _popen_git(self, *args: str, **kwargs) -> subprocess.Popen:
+        """Start `git <args>` in the repository without changing our cwd"""
+        return subprocess.Popen(["git", *args], cwd=self.git.path, **kwargs)
+
+    def _read_symbolic_ref(self, ref: str) -> Optional[str]:
+        """Read a symbolic ref straight from the git directory
 
-    def _list_versions(self) -> List[Tuple[str, str]]:
+        Returns:
+            the full name of the ref `ref` points to, or None if it doesn't
+            exist or isn't symbolic (e.g. a detached HEAD)
+        """
+        try:
+            with open(join(self.git.path, ".git", ref), "rb") as fob:
+                data = fob.read()
+        except OSError:
+            return None
+
+        if data.startswith(b"ref: "):
+            return data[5:].strip().decode()
+
+        return None
+
+    def _git_symbolic_ref(self, ref: str) -> Optional[str]:
+        """Resolve a symbolic ref through `git symbolic-ref`
+
+        Returns:
+            the full name of the ref `ref` points to, or None if it doesn't
+            exist or isn't symbolic
+        """
+        proc = self._popen_git(
+                "symbolic-ref", "-q", ref,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, error = proc.communicate()
+        if proc.returncode == 1:
+            return None
+        if proc.returncode:
+            message = error.decode(errors="replace").strip()
+            raise VerseekError(f"git symbolic-ref {ref} failed: {message}")
+
+        return output.decode(errors="replace").strip()
+
+    def _resolve_head_refs(self) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve VERSEEK_HEAD and HEAD
+
+        With the usual files ref backend both are just files in `.git` and
+        are read directly. The reftable backend keeps them in its tables
+        instead (leaving `.git/HEAD` as a `refs/heads/.invalid` stub), so
+        then git is asked. The result is kept until VERSEEK_HEAD is set or
+        we check out something else.
+
+        Returns:
+            a (verseek_head, head) tuple of full ref names, each None if
+            it doesn't exist or (for HEAD) isn't pointing to a branch
+        """
+        if self._resolved_refs is None:
+            head = self._read_symbolic_ref(Git.Head.ref)
+            if (head == "refs/heads/.invalid"
+                    or isdir(join(self.git.path, ".git", "reftable"))):
+                self._resolved_refs = (
+                    self._git_symbolic_ref(Git.VerseekHead.ref),
+                    self._git_symbolic_ref(Git.Head.ref),
+                )
+            else:
+                self._resolved_refs = (
+                    self._read_symbolic_ref(Git.VerseekHead.ref),
+                    head,
+                )
+
+        return self._resolved_refs
+
+    def _git_output(self, *args: str) -> str:
+        """Return the output of `git <args>`, stripped of whitespace"""
+        proc = self._popen_git(
+                *args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # communicate() drains both pipes together, so a chatty stderr
+        # can't block git while we're waiting on stdout
+        output, error = proc.communicate()
+        if proc.returncode:
+            message = error.decode(errors="replace").strip()
+            raise VerseekError(f"git {' '.join(args)} failed: {message}")
+
+        return output.decode(errors="replace").strip()
+
+    @staticmethod
+    def _read_batch_object(stdout: IO[bytes], header: bytes) -> Optional[bytes]:
+        """Read the contents announced by a `git cat-file --batch` header"""
+        fields = header.split()
+        if fields[-1] in (b"missing", b"ambiguous"):
+            return None
+
+        size = int(fields[2])
+        contents = stdout.read(size)
+        stdout.read(1)
+        return contents
+
+    def _read_object(self, spec: str) -> Optional[bytes]:
+        """Read an object's contents through pygit2"""
+        assert self.repo is not None
+        try:
+            return self.repo.revparse_single(spec).read_raw()
+        except (KeyError, ValueError, pygit2.GitError):
+            return None
+
+    def _cat_file(self, spec: str) -> Optional[bytes]:
+        """Read one object through a persistent `git cat-file --batch`
+
+        Unlike `_cat_file_batch` this answers requests one at a time, so
+        callers can stop asking as soon as they've found what they need.
+        """
+        if self.repo is not None:
+            return self._read_object(spec)
+
+        if self._cat_file_proc is None:
+            self._cat_file_proc = self._popen_git(
+                    "cat-file", "--batch",
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        proc = self._cat_file_proc
+        assert proc.stdin is not None and proc.stdout is not None
+
+        proc.stdin.write(spec.encode() + b"\n")
+        proc.stdin.flush()
+        header = proc.stdout.readline()
+        if not header:
+            raise VerseekError(
+                f"git cat-file --batch exited while reading `{spec}'")
+
+        return self._read_batch_object(proc.stdout, header)
+
+    def _ensure_commit_graph(self) -> None:
+        """Write the repository's commit-graph if it doesn't have one
+
+        The commit-graph saves rev-list from parsing every commit object,
+        and its changed-path bloom filters let path limited walks (such as
+        `rev-list <branch> -- debian/changelog`) skip most commits outright.
+        Commits newer than the graph still work, just without the speedup,
+        so an existing graph is left for git itself (gc, maintenance) to
+        keep up to date. This only runs once per instance, from the
+        listing commands, and failures are ignored.
+        """
+        if self._commit_graph_checked:
+            return
+        self._commit_graph_checked = True
+
+        gitdir = join(self.git.path, ".git")
+        for graph in ("objects/info/commit-graph",
+                      "objects/info/commit-graphs/commit-graph-chain"):
+            if exists(join(gitdir, graph)):
+                return
+
+        proc = self._popen_git(
+                "commit-graph", "write", "--reachable", "--changed-paths",
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        proc.wait()
+
+    def _iter_git_lines(self, *args: str) -> Iterator[str]:
+        """Stream the output of `git <args>` one line at a time
+
+        If the caller stops iterating early, git is stopped too rather
+        than being left to walk the rest of history.
+        """
+        proc = self._popen_git(*args, stdout=subprocess.PIPE)
+        assert proc.stdout is not None
+
+        exhausted = False
+        try:
+            for line in proc.stdout:
+                yield line.decode().rstrip("\n")
+            exhausted = True
+        finally:
+            proc.stdout.close()
+            if not exhausted:
+                proc.kill()
+            returncode = proc.wait()
+
+        if returncode:
+            raise VerseekError(f"git {' '.join(args)} failed")
+
+    def _iter_rev_list(self, *args: str) -> Iterator[str]:
+        """Stream `git rev-list <args>` output one commit at a time"""
+        for line in self._iter_git_lines("rev-list", *args):
+            yield line.strip()
+
+    def _iter_changelog_revisions(
+            self, tip: str, path_changelog: str, since: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """Stream the commits which changed the changelog, newest first
+
+        `git log --raw` names the changelog blob each commit left behind,
+        so it can be read directly instead of having cat-file resolve
+        `<commit>:<path>` through the commit's trees. Commits without a raw
+        diff (merges) fall back to the `<commit>:<path>` form and commits
+        which deleted the changelog are skipped.
+
+        Args:
+            tip: commit to walk back from
+            path_changelog: changelog path relative to the repository root
+            since: if given, stop at this commit (and its ancestors)
+
+        Yields:
+            (commit, object) tuples, object being a name cat-file accepts
+        """
+        # git log is porcelain, so switch off every option user config can
+        # turn on which would add lines to the output parsed below
+        revisions = [tip] if since is None else [tip, "^" + since]
+        lines = self._iter_git_lines(
+                "log", "--format=%H", "--raw", "--no-abbrev", "--no-renames",
+                "--no-follow", "--no-color", "--no-show-signature",
+                *revisions, "--", path_changelog)
+
+        suffix = ":" + path_changelog
+        pending = None
+        with contextlib.closing(lines):
+            for line in lines:
+                if line.startswith(":"):
+                    if pending is None:
+                        continue
+                    blob = line.split("\t", 1)[0].split()[3]
+                    if blob.strip("0"):
+                        yield pending, blob
+                    pending = None
+                elif line:
+                    if pending is not None:
+                        yield pending, pending + suffix
+                    pending = line
+
+        if pending is not None:
+            yield pending, pending + suffix
+
+    def _cat_file_batch(
+            self, specs: Iterable[str]
+    ) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """Read objects through a single `git cat-file --batch` process
+
+        Objects are yielded as git answers, so the caller's work on one
+        overlaps with git looking up the next.
+
+        Args:
+            specs: object names as understood by git (e.g. `<commit>:<path>`).
+                   May be a lazy iterator, in which case its items are
+                   streamed to git as they are produced.
+
+        Yields:
+            (spec, contents) tuples in the same order as `specs`, contents
+            being None for objects which don't exist
+        """
+        if self.repo is not None:
+            for spec in specs:
+                yield spec, self._read_object(spec)
+            return
+
+        proc = self._popen_git(
+                "cat-file", "--batch",
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        assert proc.stdin is not None and proc.stdout is not None
+        stdin, stdout = proc.stdin, proc.stdout
+
+        sent: List[str] = []
+        errors: List[BaseException] = []
+
+        # feed requests from a separate thread so that neither side of the
+        # pipe can fill up and deadlock, and so that git can start answering
+        # before `specs` is exhausted
+        def write_specs() -> None:
+            try:
+                for spec in specs:
+                    sent.append(spec)
+                    stdin.write(spec.encode() + b"\n")
+                    # hand each request over right away; git can't start on
+                    # it while it's sitting in our write buffer
+                    stdin.flush()
+            except BrokenPipeError:
+                pass
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                try:
+                    stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        writer = threading.Thread(target=write_specs, daemon=True)
+        writer.start()
+
+        received = 0
+        try:
+            for header in iter(stdout.readline, b""):
+                contents = self._read_batch_object(stdout, header)
+                # the writer adds each spec to `sent` before git sees it
+                yield sent[received], contents
+                received += 1
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            writer.join()
+            stdout.close()
+            proc.wait()
+
+        if errors:
+            raise errors[0]
+        if received != len(sent):
+            raise VerseekError("git cat-file --batch exited unexpectedly")
+
+    def _load_versions_cache(self) -> Dict[str, dict]:
+        try:
+            with open(self.path_versions_cache, "r") as fob:
+                cache = json.load(fob)
+        except (OSError, ValueError):
+            return {}
+
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_versions_cache(self, key: str, entry: dict) -> None:
+        """Store entry under key in `.git/verseek-cache`
+
+        The file is re-read right before writing, so entries other
+        processes saved since we last looked aren't dropped, and replaced
+        through a temporary file of our own so that concurrent writers
+        never see (or rename) each others' half written files.
+        """
+        cache = self._load_versions_cache()
+        cache[key] = entry
+
+        try:
+            fd, path_tmp = tempfile.mkstemp(
+                    dir=dirname(self.path_versions_cache),
+                    prefix="verseek-cache.")
+        except OSError:
+            # the cache is only an optimization (e.g. read-only repo)
+            return
+
+        # mkstemp creates the file 0600; give it the mode open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        try:
+            with open(fd, "w") as fob:
+                os.fchmod(fob.fileno(), 0o666 & ~umask)
+                json.dump(cache, fob)
+            os.replace(path_tmp, self.path_versions_cache)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(path_tmp)
+
+    def _resolve_changelog_history(self) -> Tuple[str, str, str]:
+        """Resolve what the changelog history is currently listed from
+
+        Returns:
+            a (key, tip, path_changelog) tuple: the versions cache key, the
+            branch tip commit and the changelog path relative to the repo
+        """
         branch = basename(self.verseek_head or self.head)
+        path_changelog = self._path_changelog_rel
+        key = branch + ":" + path_changelog
+        tip = self._git_output("rev-parse", branch)
+        return key, tip, path_changelog
+
+    @staticmethod
+    def _is_valid_entry(entry: object) -> bool:
+        """Check a versions cache entry read from disk has the right shape"""
+        if not isinstance(entry, dict) or not isinstance(entry.get("tip"), str):
+            return False
+
+        versions = entry.get("versions")
+        return isinstance(versions, list) and all(
+            isinstance(pair, list) and len(pair) == 2
+            and all(isinstance(field, str) for field in pair)
+            for pair in versions
+        )
+
+    def _cached_entry(self, key: str, tip: str) -> Optional[dict]:
+        """Return the cached versions entry for key, preferably for tip
+
+        Entries from `.git/verseek-cache` which aren't well formed (e.g. a
+        truncated or hand edited file) are ignored, like other cache errors.
+        """
+        entry = self._versions_cache.get(key)
+        if entry is None or entry["tip"] != tip:
+            stored = self._load_versions_cache().get(key)
+            if self._is_valid_entry(stored):
+                entry = stored
+
+        if entry is None:
+            return None
+
+        self._versions_cache[key] = entry
+        return entry
+
+    def _is_ancestor(self, ancestor: str, commit: str) -> bool:
+        """Return whether ancestor is in commit's history"""
+        if self.repo is not None:
+            try:
+                return self.repo.descendant_of(commit, ancestor)
+            except (KeyError, ValueError, pygit2.GitError):
+                return False
+
+        proc = self._popen_git(
+                "merge-base", "--is-ancestor", ancestor, commit,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return proc.wait() == 0
+
+    def _descends_only_from(self, since: str, tip: str) -> bool:
+        """Return whether every commit in since..tip descends from since
+
+        Only then does a walk of `tip ^since` list its commits in the same
+        order, and ahead of, everything a full walk would list after them.
+        A merged branch which forked before `since` brings in commits that
+        a full walk interleaves with the older history instead.
+        """
+        if not self._is_ancestor(since, tip):
+            return False
+
+        commits = since + ".." + tip
+        count = self._git_output("rev-list", "--count", commits)
+        descendants = self._git_output(
+                "rev-list", "--count", "--ancestry-path", commits)
+        return count == descendants
+
+    def _list_versions(self) -> List[Tuple[str, str]]:
+        """List (version, commit) pairs for the changelog's history
+
+        History before a given tip never changes, so results are cached on
+        the instance and in `.git/verseek-cache`, keyed on the branch and
+        changelog path, and reused for as long as the branch tip is the
+        same. When the branch has only moved forward from the cached tip
+        (every new commit descends from it), just the new commits are
+        walked and put in front of the cached versions.
+        """
+        key, tip, path_changelog = self._resolve_changelog_history()
+
+        entry = self._cached_entry(key, tip)
+        if entry is not None and entry["tip"] == tip:
+            return [(version, commit) for version, commit in entry["versions"]]
+
+        if entry is not None and self._descends_only_from(entry["tip"], tip):
+            versions = self._walk_versions(
+                    tip, path_changelog, since=entry["tip"])
+            versions.extend(
+                    (version, commit) for version, commit in entry["versions"])
+        else:
+            versions = self._walk_versions(tip, path_changelog)
+
+        entry = {"tip": tip, "versions": versions}
+        self._save_versions_cache(key, entry)
+        self._versions_cache[key] = entry
 
-        path_changelog = relpath(self.path_changelog, self.git.path)
-        commits = self.git.rev_list(branch, path_changelog)
+        return versions
 
-        changelogs = [
-            self.git.cat_file("blob", commit + ":" + path_changelog)
-            for commit in commits
-        ]
+    @staticmethod
+    def _parse_changelog_object(
+            obj: str, changelog: Optional[bytes]
+    ) -> Optional[str]:
+        """Parse a changelog read from git and remember its version"""
+        version = parse_changelog(changelog) if changelog is not None else None
+        _set_changelog_version(obj, version)
+        return version
+
+    def _walk_versions(
+            self, tip: str, path_changelog: str, since: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        revisions = self._iter_changelog_revisions(tip, path_changelog, since)
+
+        # cat-file only sees object names, so remember which commit each
+        # one came from as the writer thread pulls them, along with the
+        # version of changelogs which have already been parsed (taken
+        # right away, as the cache may drop them before we're done)
+        entries: List[Tuple[str, str, bool, Optional[str]]] = []
+
+        def iter_objects() -> Iterator[str]:
+            for commit, obj in revisions:
+                found, version = _get_changelog_version(obj)
+                entries.append((commit, obj, found, version))
+                if not found:
+                    yield obj
+
+        # parse each changelog as soon as it's read, while git is busy
+        # producing the next one
+        parsed: Dict[str, Optional[str]] = {}
+        for obj, changelog in self._cat_file_batch(iter_objects()):
+            parsed[obj] = self._parse_changelog_object(obj, changelog)
+
+        pairs = []
+        for commit, obj, found, version in entries:
+            if not found:
+                version = parsed[obj]
+            if version:
+                pairs.append((version, commit))
+
+        return pairs
+
+    def _find_commit_for_version(self, version: str) -> Optional[str]:
+        """Find the commit which introduced version
+
+        Returns:
+            the oldest commit anywhere in history with `version` at the top
+            of the changelog, or None if there is none
+        """
+        found = None
+        for candidate, commit in self._list_versions():
+            if candidate == version:
+                found = commit
 
-        versions = [parse_changelog(changelog) for changelog in changelogs]
-        return [
-            (version, commit) for (version, commit) in zip(versions, commits) if version
-        ]
+        return found
 
     def list_versions(self) -> List[str]:
         """ Returns a list of versions for this project """
+        self._ensure_commit_graph()
         return [version for version, commit in self._list_versions()]
 
     def _checkout(self, arg: str) -> None:
-        self.git.checkout("-q", "-f", arg)
+        self._resolved_refs = None
+        _backend_cache.clear()
+        self._git_output("checkout", "-q", "-f", arg)
 
     def _seek_restore(self) -> None:
         """restore repository to state before seek"""
@@ -255,83 +930,143 @@ class Git(Base):
         if not version:
             self._seek_restore()
         else:
-            versions = dict(self._list_versions())
-            if version not in versions:
+            commit = self._find_commit_for_version(version)
+            if not commit:
                 raise VerseekError("no such version `{}'".format(version))
 
-            commit = versions[version]
             self._seek_commit(commit)
 
 
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _rfc5322_date(dt: datetime.datetime) -> str:
+    """Format a UTC datetime the way debian/changelog trailers expect
+
+    Same as strftime("%a, %d %b %Y %H:%M:%S +0000") in the C locale, but
+    without switching the (process-wide) locale to get English names.
+    """
+    return (
+        f"{_DAYS[dt.weekday()]}, {dt.day:02d} {_MONTHS[dt.month - 1]} "
+        f"{dt.year} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} +0000"
+    )
+
+
+# git root -> (branch tip, Autoversion precached at that tip)
+_autoversion_cache: Dict[str, Tuple[str, Autoversion]] = {}
+
+
+def _get_autoversion(git_root: str, tip: str) -> Autoversion:
+    """Return a precached Autoversion for a repository, shared in-process
+
+    Precaching maps the whole history, so it's only done once per git
+    root and branch tip rather than every time a `GitSingle` is created
+    for a path in it. Once the branch moves, it's precached afresh.
+    """
+    cached = _autoversion_cache.get(git_root)
+    if cached is not None and cached[0] == tip:
+        return cached[1]
+
+    autoversion = Autoversion(git_root, precache=True)
+    _autoversion_cache[git_root] = (tip, autoversion)
+    return autoversion
+
+
 class GitSingle(Git):
     """version seeking class for git repository containing one package"""
 
     def __init__(self, path: AnyPath):
         Git.__init__(self, path)
-        self.autoversion = Autoversion(fspath(path), precache=True)
+        self._autoversion: Optional[Autoversion] = None
+
+    @property
+    def autoversion(self) -> Autoversion:
+        """Autoversion for this package, only precached once it's needed"""
+        if self._autoversion is None:
+            branch = basename(self.verseek_head or self.head)
+            tip = self._git_output("rev-parse", branch)
+            self._autoversion = _get_autoversion(self.git.path, tip)
+
+        return self._autoversion
 
     def _get_commit_datetime(self, commit: str) -> datetime.datetime:
-        output = self.git.cat_file("commit", commit)
-        m = re.search(r" (\d{10}) ", output)
-        assert m is not None
-        timestamp = int(m.group(1))
-        return datetime.datetime.utcfromtimestamp(timestamp)
+        """Return the author date of commit (as naive UTC)"""
+        # peel tags (e.g. `v1.0') to the commit they point at, as
+        # `git cat-file commit' does
+        output = self._cat_file(commit + "^{commit}")
+        if output is None:
+            raise VerseekError(f"no such commit `{commit}'")
+
+        # the author line of the header looks like
+        # `author <name> <<email>> <timestamp> <tz>'
+        header = output.split(b"\n\n", 1)[0]
+        for line in header.split(b"\n"):
+            if line.startswith(b"author "):
+                timestamp = int(line.rsplit(b" ", 2)[-2])
+                return datetime.datetime.fromtimestamp(
+                        timestamp, datetime.timezone.utc).replace(tzinfo=None)
+
+        raise VerseekError(f"can't parse author date of commit `{commit}'")
 
     def _create_changelog(
             self, version: str, entry_datetime: datetime.datetime
     ) -> None:
         release = "UNRELEASED"
 
-        def parse_control(path: str) -> Dict[str, str]:
-            with open(path, "r") as fob:
-                lines = [line.rstrip() for line in fob if not line.startswith(" ")]
-            return {
-                    k: v for (k, v) in [
-                    re.split(r"\s*:\s*", line, 1)
-                    for line in lines
-                    if line and ":" in line
-                ]
-            }
-
-        control = parse_control(self.path_control)
-
-        with LocaleAs(locale.LC_TIME, "C"):
-            with open(self.path_changelog, "w") as fob:
-                print(
-                    "{} ({}) {}; urgency=low"
-                    "".format(control["Source"], version, release),
-                    file=fob,
-                )
-                print(file=fob)
-                print("  * undocumented", file=fob)
-                print(file=fob)
-                print(
-                    " --  {}  {}"
-                    "".format(
-                        control["Maintainer"],
-                        entry_datetime.strftime("%a, %d %b %Y %H:%M:%S +0000"),
-                    ),
-                    file=fob,
-                )
+        control = self._parse_control(self.path_control)
+
+        timestamp = _rfc5322_date(entry_datetime)
+
+        changelog = (
+            f"{control['Source']} ({version}) {release}; urgency=low\n"
+            "\n"
+            "  * undocumented\n"
+            "\n"
+            f" --  {control['Maintainer']}  {timestamp}\n"
+        ).encode()
+
+        # the whole stanza is tiny, hand it to the kernel in one write;
+        # like open(), leave the permissions to the umask
+        fd = os.open(
+                self.path_changelog, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            while changelog:
+                changelog = changelog[os.write(fd, changelog):]
+        finally:
+            os.close(fd)
 
     def seek_version(self, version: Optional[str] = None) -> None:
         """ Attempts to checkout a given version of this project """
         if not version:
-            if exists(self.path_changelog):
+            try:
                 os.remove(self.path_changelog)
+            except FileNotFoundError:
+                pass
 
             self._seek_restore()
         else:
             commit = self.autoversion.version2commit(version)
+            # the date comes from the object database, so it can be read
+            # before checking out; the control file has to be read after
+            entry_datetime = self._get_commit_datetime(commit)
             self._seek_commit(commit)
-            self._create_changelog(version, self._get_commit_datetime(commit))
+            self._create_changelog(version, entry_datetime)
 
     def list_versions(self) -> List[str]:
         """ Returns a list of versions for this project """
         branch = basename(self.verseek_head or self.head)
+        self._ensure_commit_graph()
+
+        # Autoversion has no bulk API; bind the method once and map it
+        commit2version = self.autoversion.commit2version
+        return list(map(commit2version, self._iter_rev_list(branch)))
 
-        commits = self.git.rev_list(branch)
-        return [self.autoversion.commit2version(commit) for commit in commits]
+
+# storage type detected by new() for each path; a checkout can change the
+# answer (e.g. by adding or removing debian/control) so it resets this
+_backend_cache: Dict[str, Type[Base]] = {}
 
 
 def new(path: AnyPath) -> Base:
@@ -348,13 +1083,24 @@ def new(path: AnyPath) -> Base:
             - `verseek_lib.Plain` otherwise
     """
 
-    root = Git.get_git_root(path)
-    if root:
-        if exists(join(root, "debian/control")):
-            return GitSingle(path)
+    spath = abspath(fspath(path))
+    backend = _backend_cache.get(spath)
+    if backend is None:
+        root = Git.get_git_root(spath)
+        if root:
+            # a package at the root of its repository is git-single by
+            # definition; Base.__init__ checks its debian/control anyway, so
+            # only paths below the root need probing here
+            if root == spath or exists(root + os.sep + "debian/control"):
+                backend = GitSingle
+            else:
+                backend = Git
+        else:
+            backend = Plain
+
+        _backend_cache[spath] = backend
 
-        return Git(path)
-    return Plain(path)
+    return backend(path)
 
 
 def list_versions(path: AnyPath) -> List[str]: